@@ -3,57 +3,84 @@ __author__ = 'katharine'
 
 import atexit
 import argparse
+import importlib
 import logging
 import os
 import sys
-import requests.packages.urllib3 as urllib3
 from pebble_tool.util import get_persist_dir
 from six import text_type
 
+from .commands import COMMANDS
 from .exceptions import ToolError
 from .sdk import sdk_version
-from .util.analytics import wait_for_analytics, analytics_prompt
 from .util.config import config
-from .util.updates import wait_for_update_checks
-from .util.update_notify import check_for_updates, wait_for_update_notify
 from .util.wsl import maybe_apply_wsl_hacks
-from importlib.metadata import version
+from . import _version
 
-__version__ = version('pebble-tool')
-# Parse version into version_info tuple
-parts = __version__.split('.')
-__version_info__ = tuple(int(p) for p in parts[:3])
+__version__ = _version.__version__
+__version_info__ = _version.__version_info__
 
-# Violating PEP8 for custom command ordering for `pebble -h`
-from .commands.sdk import manage
-from .commands.sdk.project import build
+# Set once a command module has been loaded; only then is there background work to wait for.
+_command_loaded = False
+
+
+def _sniff_subcommand(args):
+    for arg in args:
+        if not arg.startswith('-'):
+            return arg
+    return None
+
+
+def _register_commands(parser, selected):
+    global _command_loaded
+    subparsers = parser.add_subparsers(title="command")
+    for name, module, help_text in COMMANDS:
+        if name == selected:
+            importlib.import_module(module)
+            from .commands.base import register_command
+            register_command(subparsers, name)
+            _command_loaded = True
+        else:
+            # Placeholder so `pebble -h` can list the command; it is never parsed into.
+            subparsers.add_parser(name, help=help_text)
+
+
+def _version_string():
+    version_string = "Pebble Tool v{}".format(__version__)
+    if sdk_version() is not None:
+        version_string += " (active SDK: v{})".format(sdk_version())
+    return version_string
 
-from .commands.base import register_children
-from .commands import (install, logs, screenshot, timeline, emucontrol, ping, account, repl,
-                       transcription_server, data_logging, publish, firmware, appmessage)
-from .commands.sdk import create, emulator
-from .commands.sdk.project import package, analyse_size, convert, debug, compile_commands
 
 def run_tool(args=None):
-    urllib3.disable_warnings()  # sigh. :(
+    if args is None:
+        args = sys.argv[1:]
+    # Answer version probes before building any parsers.
+    if args[:1] in (['-V'], ['--version']):
+        print(_version_string())
+        sys.exit(0)
+
     logging.basicConfig()
     maybe_apply_wsl_hacks()
-    analytics_prompt()
     parser = argparse.ArgumentParser(description="Pebble Tool", prog="pebble",
                                      epilog="For help on an individual command, call that command with --help.")
-    version_string = "Pebble Tool v{}".format(__version__)
     if sdk_version() is not None:
-        version_string += " (active SDK: v{})".format(sdk_version())
         # Add QEMU and others to PATH
         os.environ['PATH'] = "{}:{}".format(os.path.join(get_persist_dir(), "SDKs", sdk_version(), "toolchain", "bin"), os.environ['PATH'])
         extra_path = os.environ.get('PEBBLE_EXTRA_PATH')
         if extra_path:
             os.environ['PATH'] = "{}:{}".format(extra_path, os.environ['PATH'])
-    parser.add_argument("--version", action="version", version=version_string)
-    register_children(parser)
+    parser.add_argument("-V", "--version", action="version", version=_version_string())
+    _register_commands(parser, _sniff_subcommand(args))
     args = parser.parse_args(args)
     if not hasattr(args, 'func'):
         parser.error("no subcommand specified.")
+
+    import requests.packages.urllib3 as urllib3
+    from .util.analytics import analytics_prompt
+    from .util.update_notify import check_for_updates
+    urllib3.disable_warnings()  # sigh. :(
+    analytics_prompt()
     check_for_updates()
     try:
         args.func(args)
@@ -64,10 +91,14 @@ def run_tool(args=None):
 
 @atexit.register
 def wait_for_cleanup():
-    import time
-    now = time.time()
-    wait_for_analytics(2)
-    wait_for_update_checks(2)
-    wait_for_update_notify(3)
-    logging.info("Spent %f seconds waiting for analytics.", time.time() - now)
+    if _command_loaded:
+        import time
+        from .util.analytics import wait_for_analytics
+        from .util.updates import wait_for_update_checks
+        from .util.update_notify import wait_for_update_notify
+        now = time.time()
+        wait_for_analytics(2)
+        wait_for_update_checks(2)
+        wait_for_update_notify(3)
+        logging.info("Spent %f seconds waiting for analytics.", time.time() - now)
     config.save()
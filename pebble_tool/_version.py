@@ -0,0 +1,7 @@
+__author__ = 'katharine'
+
+from importlib.metadata import version
+
+__version__ = version('pebble-tool')
+# Parse version into version_info tuple
+__version_info__ = tuple(int(p) for p in __version__.split('.')[:3])
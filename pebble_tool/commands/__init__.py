@@ -1,2 +1,67 @@
 __author__ = 'katharine'
 
+# Every top-level command, in `pebble -h` order, with the module that defines it and its help text.
+# run_tool builds the top-level parser from this table and only imports the module for the command
+# actually being run, so `pebble --help` and typos don't pay for libpebble2 and friends.
+# Keep the help text in sync with the command's docstring.
+COMMANDS = (
+    ('sdk', 'pebble_tool.commands.sdk.manage', "Manages available SDKs"),
+    ('build', 'pebble_tool.commands.sdk.project.build', "Builds the current project."),
+    ('clean', 'pebble_tool.commands.sdk.project.build', None),
+    ('install', 'pebble_tool.commands.install', "Installs the given app on the watch."),
+    ('logs', 'pebble_tool.commands.logs', "Displays running logs from the watch."),
+    ('screenshot', 'pebble_tool.commands.screenshot', "Takes a screenshot from the watch."),
+    ('insert-pin', 'pebble_tool.commands.timeline', "Inserts a pin into the timeline."),
+    ('delete-pin', 'pebble_tool.commands.timeline', "Deletes a pin from the timeline."),
+    ('emu-accel', 'pebble_tool.commands.emucontrol', "Emulates accelerometer events."),
+    ('emu-app-config', 'pebble_tool.commands.emucontrol', "Shows the app configuration page, if one exists."),
+    ('emu-battery', 'pebble_tool.commands.emucontrol', "Sets the emulated battery level and charging state."),
+    ('emu-bt-connection', 'pebble_tool.commands.emucontrol', "Sets the emulated Bluetooth connectivity state."),
+    ('emu-compass', 'pebble_tool.commands.emucontrol', "Sets the emulated compass heading and calibration state."),
+    ('emu-control', 'pebble_tool.commands.emucontrol', "Control emulator interactively"),
+    ('emu-tap', 'pebble_tool.commands.emucontrol', "Emulates a tap."),
+    ('emu-time-format', 'pebble_tool.commands.emucontrol', "Sets the emulated time format (12h or 24h)."),
+    ('emu-set-time', 'pebble_tool.commands.emucontrol', "Sets the emulated watch time."),
+    ('emu-set-timeline-quick-view', 'pebble_tool.commands.emucontrol', None),
+    ('emu-set-content-size', 'pebble_tool.commands.emucontrol', None),
+    ('emu-button', 'pebble_tool.commands.emucontrol', "Press buttons on the emulator."),
+    ('emu-steps', 'pebble_tool.commands.emucontrol', "Sets the step count for the current day in the emulator."),
+    ('emu-distance', 'pebble_tool.commands.emucontrol',
+     "Sets the distance walked (meters) for the current day in the emulator."),
+    ('emu-calories', 'pebble_tool.commands.emucontrol',
+     "Sets the active (and optionally resting) calories for the current day in the emulator."),
+    ('emu-active-time', 'pebble_tool.commands.emucontrol',
+     "Sets the active time (minutes) for the current day in the emulator."),
+    ('emu-sleep', 'pebble_tool.commands.emucontrol',
+     "Sets the total (and optionally restful) sleep minutes for the current day in the emulator."),
+    ('emu-heart-rate', 'pebble_tool.commands.emucontrol',
+     "Injects a heart rate reading into the emulator (emery board only)."),
+    ('ping', 'pebble_tool.commands.ping', "Pings the watch."),
+    ('login', 'pebble_tool.commands.account',
+     "Logs you in using Firebase auth. Required for CloudPebble and publish flows."),
+    ('logout', 'pebble_tool.commands.account', "Logs you out of your Pebble account."),
+    ('repl', 'pebble_tool.commands.repl', "Launches a python prompt with a 'pebble' object already connected."),
+    ('transcribe', 'pebble_tool.commands.transcription_server',
+     " Starts a voice server listening for voice transcription requests from the app "),
+    ('data-logging', 'pebble_tool.commands.data_logging', "Get info on or download data logging data"),
+    ('publish', 'pebble_tool.commands.publish',
+     "Builds and uploads a release to the appstore dashboard API using Firebase auth."),
+    ('fw', 'pebble_tool.commands.firmware', "Firmware management commands."),
+    ('send-app-message', 'pebble_tool.commands.appmessage',
+     "Sends an App Message key-value dictionary to the running watchapp."),
+    ('new-project', 'pebble_tool.commands.sdk.create',
+     "Creates a new pebble project with the given name in a new directory."),
+    ('new-package', 'pebble_tool.commands.sdk.create',
+     "Creates a new pebble package (not app or watchface) with the given name in a new directory."),
+    ('kill', 'pebble_tool.commands.sdk.emulator', "Kills running emulators, if any."),
+    ('wipe', 'pebble_tool.commands.sdk.emulator',
+     "Wipes data for running emulators. By default, only clears data for the current SDK version."),
+    ('package', 'pebble_tool.commands.sdk.project.package', "Manages npm packages."),
+    ('analyze-size', 'pebble_tool.commands.sdk.project.analyse_size', "Analyze the size of your pebble app."),
+    ('convert-project', 'pebble_tool.commands.sdk.project.convert',
+     "Converts an appinfo project from SDK 2 or SDK 3 to a modern package.json project."),
+    ('gdb', 'pebble_tool.commands.sdk.project.debug',
+     "Connects a debugger to the current app. Only works in the emulator."),
+    ('compile-commands', 'pebble_tool.commands.sdk.project.compile_commands',
+     "Generate a compile_commands.json so editors (clangd, etc.) can resolve the Pebble SDK."),
+)
@@ -377,7 +377,7 @@ class PebbleTransportEmulator(PebbleTransportConfiguration):
                                " Defaults to the active SDK (currently {})".format(sdk_version()))
         emu_group.add_argument('--vnc', action='store_true', help="When using --emulator, enable VNC server.")
 
-def register_children(parser):
-    subparsers = parser.add_subparsers(title="command")
+def register_command(subparsers, name):
     for command in _CommandRegistry:
-        command.add_parser(subparsers)
+        if command.command == name:
+            return command.add_parser(subparsers)
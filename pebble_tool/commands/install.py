@@ -2,12 +2,10 @@ __author__ = 'katharine'
 
 import os
 import os.path
-from progressbar import ProgressBar, Bar, FileTransferSpeed, Timer, Percentage
 
 from libpebble2.communication.transports.websocket import WebsocketTransport, MessageTargetPhone
 from libpebble2.communication.transports.websocket.protocol import WebSocketInstallBundle, WebSocketInstallStatus
 from libpebble2.exceptions import TimeoutError
-from libpebble2.services.install import AppInstaller
 
 from .base import PebbleCommand
 from ..util import is_debug_build
@@ -125,8 +123,7 @@ class ToolAppInstaller(object):
         self.pebble = pebble
         self.pbw = pbw or 'build/{}.pbw'.format(os.path.basename(os.getcwd()))
         self.quiet = quiet
-        self.progress_bar = ProgressBar(widgets=[Percentage(), Bar(marker='=', left='[', right=']'), ' ',
-                                                 FileTransferSpeed(), ' ', Timer(format='%s')])
+        self.progress_bar = None
 
     def install(self, force_install=False):
         if isinstance(self.pebble.transport, WebsocketTransport):
@@ -135,6 +132,12 @@ class ToolAppInstaller(object):
             self._install_via_serial(self.pebble, self.pbw, force_install=force_install)
 
     def _install_via_serial(self, pebble, pbw, force_install=False):
+        # Only needed for direct connections; emulator and phone installs go over the websocket and never load these.
+        from libpebble2.services.install import AppInstaller
+        from progressbar import ProgressBar, Bar, FileTransferSpeed, Timer, Percentage
+
+        self.progress_bar = ProgressBar(widgets=[Percentage(), Bar(marker='=', left='[', right=']'), ' ',
+                                                 FileTransferSpeed(), ' ', Timer(format='%s')])
         installer = AppInstaller(pebble, pbw)
         self.progress_bar.maxval = installer.total_size
         self.progress_bar.start()
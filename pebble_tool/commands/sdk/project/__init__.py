@@ -31,7 +31,8 @@ class SDKProjectCommand(SDKCommand):
         venv = os.path.join(self.get_sdk_path(), '..', '.venv')
         node_modules = os.path.join(self.get_sdk_path(), '..', 'node_modules')
         command = [os.path.join(venv, 'bin', 'python'), self.waf_path, command] + args
-        logger.debug("waf command: %s", subprocess.list2cmdline(command))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("waf command: %s", subprocess.list2cmdline(command))
         env = os.environ.copy()
         env['PYTHONHOME'] = os.path.abspath(venv)
         env['PYTHONPATH'] = ':'.join(sys.path)
@@ -32,6 +32,10 @@ black_hole = open(os.devnull, 'w')
 
 _qemu_version_cache = None
 
+# Any of these in the serial output means the firmware has booted far enough to talk to.
+_BOOT_MARKERS = (b"<SDK Home>", b"<Launcher>", b"Ready for communication")
+_BOOT_MARKER_OVERLAP = max(len(marker) for marker in _BOOT_MARKERS) - 1
+
 def get_qemu_version():
     """Detect the QEMU major version. Returns the major version as an int, or None if detection fails."""
     global _qemu_version_cache
@@ -413,7 +417,8 @@ class ManagedEmulatorTransport(WebsocketTransport):
                 env['DYLD_LIBRARY_PATH'] = toolchain_lib_path
             logger.debug("Set DYLD_LIBRARY_PATH=%s", env['DYLD_LIBRARY_PATH'])
 
-        logger.info("Qemu command: %s", subprocess.list2cmdline(command))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Qemu command: %s", subprocess.list2cmdline(command))
         # Detached into its own process group so a terminal Ctrl+C doesn't kill it.
         process = subprocess.Popen(command, stdout=self._get_output(), stderr=self._get_output(), env=env,
                                    start_new_session=True)
@@ -441,16 +446,19 @@ class ManagedEmulatorTransport(WebsocketTransport):
         else:
             post_event("qemu_launched", success=False, reason="qemu_launch_timeout")
             raise ToolError("Emulator launch timed out.")
-        received = b''
+        # Only the unread output, plus enough of the previous read to catch a marker split across two, is searched.
+        tail = b''
         while True:
             try:
-                received += s.recv(256)
+                received = tail + s.recv(65536)
             except socket.error as e:
                 # Ignore "Interrupted system call"
                 if e.errno != errno.EINTR:
                     raise
-            if b"<SDK Home>" in received or b"<Launcher>" in received or b"Ready for communication" in received:
+                continue
+            if any(marker in received for marker in _BOOT_MARKERS):
                 break
+            tail = received[-_BOOT_MARKER_OVERLAP:]
         s.close()
         post_event("qemu_launched", success=True)
         logger.info("Firmware booted.")
@@ -469,11 +477,7 @@ class ManagedEmulatorTransport(WebsocketTransport):
             # Copy the compressed file.
             with bz2.BZ2File(sdk_qemu_spi_flash) as from_file:
                 with open(path, 'wb') as to_file:
-                    while True:
-                        data = from_file.read(512)
-                        if not data:
-                            break
-                        to_file.write(data)
+                    shutil.copyfileobj(from_file, to_file)
 
     def _get_spi_path(self):
         platform = self.platform
@@ -496,7 +500,8 @@ class ManagedEmulatorTransport(WebsocketTransport):
             'localhost:5901'               # VNC server (QEMU on display :1)
         ]
         
-        logger.info("websockify command: %s", subprocess.list2cmdline(command))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("websockify command: %s", subprocess.list2cmdline(command))
         # Detached into its own process group so a terminal Ctrl+C doesn't kill it.
         process = subprocess.Popen(command, stdout=self._get_output(), stderr=self._get_output(),
                                    start_new_session=True)
@@ -529,7 +534,8 @@ class ManagedEmulatorTransport(WebsocketTransport):
             command.extend(['--oauth', account.bearer_token])
         if logger.getEffectiveLevel() <= logging.DEBUG:
             command.append('--debug')
-        logger.info("pypkjs command: %s", subprocess.list2cmdline(command))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("pypkjs command: %s", subprocess.list2cmdline(command))
         # Detached into its own process group so a terminal Ctrl+C doesn't kill it.
         process = subprocess.Popen(command, stdout=self._get_output(), stderr=self._get_output(),
                                    start_new_session=True)
@@ -762,7 +768,8 @@ class ExternalQemuTransport(WebsocketTransport):
             command.extend(['--oauth', account.bearer_token])
         if logger.getEffectiveLevel() <= logging.DEBUG:
             command.append('--debug')
-        logger.info("pypkjs command: %s", subprocess.list2cmdline(command))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("pypkjs command: %s", subprocess.list2cmdline(command))
         # Detached into its own process group so a terminal Ctrl+C doesn't kill it.
         process = subprocess.Popen(command, stdout=self._get_output(), stderr=self._get_output(),
                                    start_new_session=True)
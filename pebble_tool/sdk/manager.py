@@ -2,18 +2,17 @@
 __author__ = 'katharine'
 
 import platform
-from contextlib import closing
+import concurrent.futures
 import errno
+import functools
 import json
 import os
-from progressbar import ProgressBar, Percentage, Bar, FileTransferSpeed, Timer
-import requests
+import queue
+import re
 import shutil
 import subprocess
-import sys
-import tempfile
-import tarfile
-import textwrap
+import threading
+import venv
 
 from pebble_tool.exceptions import SDKInstallError, MissingSDK
 from pebble_tool.sdk.requirements import Requirements
@@ -23,16 +22,24 @@ from pebble_tool.util.npm import invoke_npm
 from pebble_tool.util.versions import version_to_key
 
 _FALLBACK_PLATFORMS = ('aplite', 'basalt', 'chalk', 'diorite', 'emery', 'flint', 'gabbro')
+# Absolute paths, or anything that could climb out of the extraction directory.
+_questionable_path = re.compile(r"^/|\.\.")
 
 def get_pebble_platforms(sdk_path=None):
     """Get platforms from the installed SDK, with fallback to hardcoded list."""
-    try:
+    if sdk_path is None:
+        from pebble_tool.sdk import sdk_manager
+        sdk_path = sdk_manager.current_path
         if sdk_path is None:
-            from pebble_tool.sdk import sdk_manager
-            sdk_path = sdk_manager.current_path
-            if sdk_path is None:
-                return _FALLBACK_PLATFORMS
+            return _FALLBACK_PLATFORMS
+    # Keyed on the real path, as `current` keeps the same name when the active SDK changes.
+    return _load_pebble_platforms(os.path.realpath(sdk_path))
+
 
+@functools.lru_cache(maxsize=None)
+def _load_pebble_platforms(sdk_path):
+    # Every command's parser asks for the platform list, so only load the SDK's platform module once per SDK.
+    try:
         # Try standard SDK structure: <sdk-core>/pebble/common/tools/pebble_sdk_platform.py
         platform_file = os.path.join(sdk_path, 'pebble', 'common', 'tools', 'pebble_sdk_platform.py')
         # Also try tintin structure: <sdk>/common/tools/pebble_sdk_platform.py
@@ -49,35 +56,123 @@ def get_pebble_platforms(sdk_path=None):
         pass
     return _FALLBACK_PLATFORMS
 
+def _load_manifest(manifest_path):
+    with open(manifest_path, 'rb') as f:
+        try:
+            return json.loads(f.read())
+        except ValueError:
+            return None
+
+
+def _start_in_background(fn, *args, **kwargs):
+    """Runs fn on a daemon thread, so an interrupted install never waits for it to finish."""
+    future = concurrent.futures.Future()
+
+    def run():
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+def _discard_download(future):
+    if future.exception() is None:
+        future.result()[0].close()
+
+
+def _process_exists(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _checked_members(t):
+    # Validates names as extraction proceeds, so the archive is only walked once.
+    for member in t:
+        if _questionable_path.search(member.name):
+            raise SDKInstallError("SDK contained a questionable file: {}".format(member.name))
+        yield member
+
+
+class _ProgressReader(object):
+    """Wraps a readable stream, advancing a progress bar as it is consumed."""
+    def __init__(self, stream, bar, interval):
+        self.stream = stream
+        self.bar = bar
+        self.interval = interval
+        self.position = 0
+        self.last_update = 0
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.position += len(data)
+        if self.position - self.last_update >= self.interval:
+            # A transfer encoding can make the decoded stream longer than the advertised length.
+            self.bar.update(min(self.position, self.bar.max_value))
+            self.last_update = self.position
+        return data
+
+
 class SDKManager(object):
     DOWNLOAD_SERVER = "https://sdk.repebble.com"
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+    PROGRESS_INTERVAL = 256 * 1024
+    DOWNLOAD_CONNECTIONS = 4
+    RANGE_SIZE = 8 * 1024 * 1024
+    # Small downloads never touch the disk before being extracted.
+    SPOOL_SIZE = 16 * 1024 * 1024
 
     def __init__(self, sdk_dir=None):
         self.sdk_dir = os.path.normpath(sdk_dir or os.path.join(get_persist_dir(), "SDKs"))
         if not os.path.exists(self.sdk_dir):
             os.makedirs(self.sdk_dir)
+        self._sdk_cache = None
+        self._sdk_cache_key = None
+        self._http_session = None
 
     def list_local_sdks(self):
-        sdks = []
         try:
-            for dir in os.listdir(self.sdk_dir):
-                dir = os.path.join(self.sdk_dir, dir)
-                if os.path.islink(dir):
-                    continue
-                manifest_path = os.path.join(dir, 'sdk-core', 'manifest.json')
-                if not os.path.exists(manifest_path):
-                    continue
-                with open(manifest_path) as f:
-                    try:
-                        sdks.append(json.load(f))
-                    except ValueError:
-                        pass
+            manifests = self._local_manifests()
         except OSError as e:
             if e.errno != errno.ENOENT:
                 raise
             return []
 
-        return sdks
+        # Manifests are only re-read when an SDK is added, removed or rewritten.
+        if manifests != self._sdk_cache_key:
+            manifest_paths = [manifest_path for manifest_path, _ in manifests]
+            if len(manifest_paths) > 1:
+                # Overlap the reads; this matters when the persist dir is on a slow or network-mounted disk.
+                with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(manifest_paths))) as executor:
+                    loaded = list(executor.map(_load_manifest, manifest_paths))
+            else:
+                loaded = [_load_manifest(manifest_path) for manifest_path in manifest_paths]
+            self._sdk_cache = [sdk for sdk in loaded if sdk is not None]
+            self._sdk_cache_key = manifests
+
+        return list(self._sdk_cache)
+
+    def _local_manifests(self):
+        manifests = []
+        with os.scandir(self.sdk_dir) as it:
+            for entry in it:
+                # Skip the `current` link and any install still being extracted.
+                if entry.is_symlink() or entry.name.startswith('.'):
+                    continue
+                manifest_path = os.path.join(entry.path, 'sdk-core', 'manifest.json')
+                try:
+                    mtime = os.stat(manifest_path).st_mtime_ns
+                except OSError:
+                    continue
+                manifests.append((manifest_path, mtime))
+        return tuple(sorted(manifests))
 
     def list_local_sdk_versions(self):
         return {x['version'] for x in self.list_local_sdks()}
@@ -98,45 +193,132 @@ class SDKManager(object):
 
     def install_from_url(self, url):
         print("Downloading...")
-
-        response = requests.head(url)
+        response = self._session.get(url, stream=True)
         response.raise_for_status()
-        total_size = int(response.headers.get('content-length', 0))
-
-        bar = ProgressBar(
-            maxval=total_size,
-            widgets=[
-                Percentage(),
-                Bar(marker='=', left='[', right=']'),
-                ' ',
-                FileTransferSpeed(),
-                ' ',
-                Timer(format='%s')
-            ]
-        )
+        # The tarball is extracted as it arrives, so read the raw stream; decode any transfer encoding ourselves.
+        response.raw.read = functools.partial(response.raw.read, decode_content=True)
+        self._install_from_handle(response.raw, int(response.headers.get('content-length', 0)))
 
-        bar.start()
+    def _download_toolchain(self, sdk_version, cancel=None):
+        import requests
+        import tempfile
+        platform_name = "mac" if platform.system() == "Darwin" else "linux"
+        arch = platform.machine()
 
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
+        # Try architecture-specific toolchain first, fall back to platform-only
+        arch_specific_url = f"{self.DOWNLOAD_SERVER}/releases/{sdk_version}/toolchain-{platform_name}-{arch}.tar.gz"
+        fallback_url = f"{self.DOWNLOAD_SERVER}/releases/{sdk_version}/toolchain-{platform_name}.tar.gz"
 
-        with tempfile.TemporaryFile() as f:
-            for content in response.iter_content(512):
-                bar.update(bar.currval + len(content))
-                f.write(content)
-            bar.finish()
-            f.flush()
-            f.seek(0)
-            self._install_from_handle(f)
+        url, toolchain_name = fallback_url, platform_name
+        try:
+            response = self._session.head(arch_specific_url)
+            if response.status_code == 200:
+                url, toolchain_name = arch_specific_url, f"{platform_name}-{arch}"
+        except requests.RequestException:
+            pass
 
-    def install_toolchain_from_url(self, url, sdk_version, platform_name):
         print("Downloading toolchain...")
+        f = tempfile.SpooledTemporaryFile(max_size=self.SPOOL_SIZE)
+        try:
+            # This runs alongside other install steps, so it has no progress bar; one would just garble their output.
+            self._download_to_file(url, f, cancel)
+        except BaseException:
+            f.close()
+            raise
+        return f, toolchain_name
 
-        response = requests.head(url)
+    def _download_to_file(self, url, f, cancel=None):
+        # `cancel` is an Event that stops the download (with an SDKInstallError) once set.
+        if cancel is None:
+            cancel = threading.Event()
+        response = self._session.head(url, allow_redirects=True)
         response.raise_for_status()
         total_size = int(response.headers.get('content-length', 0))
 
-        bar = ProgressBar(
+        # Large files from servers that accept byte ranges are fetched over several connections at once. Ranges of
+        # an encoded body can't be decoded independently, so those always use a single stream.
+        if (response.headers.get('accept-ranges') == 'bytes' and 'content-encoding' not in response.headers
+                and total_size >= 2 * self.RANGE_SIZE):
+            self._download_ranges(url, f, total_size, cancel)
+        else:
+            response = self._session.get(url, stream=True)
+            response.raise_for_status()
+
+            # This loop runs once per chunk, so keep attribute lookups out of it.
+            write = f.write
+            cancelled = cancel.is_set
+            for content in response.iter_content(self.DOWNLOAD_CHUNK_SIZE):
+                if cancelled():
+                    raise SDKInstallError("Download of {} was cancelled.".format(url))
+                write(content)
+        f.flush()
+        f.seek(0)
+
+    def _download_ranges(self, url, f, total_size, cancel):
+        ranges = [(start, min(start + self.RANGE_SIZE, total_size) - 1)
+                  for start in range(0, total_size, self.RANGE_SIZE)]
+        pending = iter(ranges)
+        lock = threading.Lock()
+        stop = threading.Event()
+        results = queue.Queue()
+
+        def fetch(fd, start, end):
+            if stop.is_set() or cancel.is_set():
+                raise SDKInstallError("Download of {} was cancelled.".format(url))
+            response = self._session.get(url, headers={'Range': 'bytes={}-{}'.format(start, end)}, stream=True)
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise SDKInstallError("Server ignored a range request for {}.".format(url))
+            pwrite = os.pwrite
+            position = start
+            for content in response.iter_content(self.DOWNLOAD_CHUNK_SIZE):
+                if stop.is_set() or cancel.is_set():
+                    raise SDKInstallError("Download of {} was cancelled.".format(url))
+                pwrite(fd, content, position)
+                position += len(content)
+            if position != end + 1:
+                raise SDKInstallError("Download of {} was truncated.".format(url))
+
+        # Daemon threads rather than an executor: the interpreter joins executor workers at exit, so an interrupted
+        # install would otherwise wait for every in-flight range to finish.
+        def work(fd):
+            try:
+                while True:
+                    with lock:
+                        span = next(pending, None)
+                    if span is None:
+                        return
+                    try:
+                        fetch(fd, *span)
+                    except BaseException as e:
+                        results.put(e)
+                        return
+                    results.put(None)
+            finally:
+                os.close(fd)
+
+        # Each range is written at its own offset, so the file needs a real descriptor rather than a spool. Workers
+        # aren't joined on failure, so each writes through its own duplicate: a worker still finishing a chunk after
+        # `f` is closed can only ever write to this download, never to a file that later reuses the descriptor.
+        try:
+            for _ in range(min(self.DOWNLOAD_CONNECTIONS, len(ranges))):
+                fd = os.dup(f.fileno())
+                try:
+                    threading.Thread(target=work, args=(fd,), daemon=True).start()
+                except BaseException:
+                    os.close(fd)
+                    raise
+            for _ in ranges:
+                error = results.get()
+                if error is not None:
+                    raise error
+        finally:
+            stop.set()
+
+    @staticmethod
+    def _progress_bar(total_size):
+        from progressbar import ProgressBar, Percentage, Bar, FileTransferSpeed, Timer
+        return ProgressBar(
             maxval=total_size,
             widgets=[
                 Percentage(),
@@ -148,107 +330,134 @@ class SDKManager(object):
             ]
         )
 
-        bar.start()
-
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-
-        with tempfile.TemporaryFile() as f:
-            for content in response.iter_content(512):
-                bar.update(bar.currval + len(content))
-                f.write(content)
-            bar.finish()
-            f.flush()
-            f.seek(0)
-            self._install_toolchain_from_handle(f, sdk_version, platform_name)
-
     def install_from_path(self, path):
+        print("Extracting...")
         with open(path, 'rb') as f:
-            self._install_from_handle(f)
+            self._install_from_handle(f, os.fstat(f.fileno()).st_size)
 
-    def _install_from_handle(self, f):
+    def _install_from_handle(self, f, total_size):
+        import tarfile
         path = None
+        npm_future = None
+        toolchain_future = None
+        toolchain_cancel = threading.Event()
+        # Extract next to the final location, then rename into place once the manifest checks out. This lets a
+        # non-seekable stream be read in a single pass without first looking up the manifest.
+        staging_path = os.path.join(self.sdk_dir, '.install-{}'.format(os.getpid()))
         try:
-            print("Extracting...")
-            with tarfile.open(fileobj=f, mode="r:*") as t:
-                with closing(t.extractfile('sdk-core/manifest.json')) as f_manifest:
-                    sdk_info = json.load(f_manifest)
-                path = os.path.normpath(os.path.join(self.sdk_dir, sdk_info['version']))
-                if os.path.exists(path):
-                    raise SDKInstallError("SDK {} is already installed.".format(sdk_info['version']))
-                contents = t.getnames()
-                for filename in contents:
-                    if filename.startswith('/') or '..' in filename:
-                        raise SDKInstallError("SDK contained a questionable file: {}".format(filename))
-                if not path.startswith(self.sdk_dir):
-                    raise SDKInstallError("Suspicious version number: {}".format(sdk_info['version']))
-                Requirements(sdk_info['requirements']).ensure_satisfied()
-                os.mkdir(os.path.join(self.sdk_dir, sdk_info['version']))
-                t.extractall(path)
-            venv_path = os.path.join(path, ".venv")
-            print("Preparing venv... (this may take a while)")
-            subprocess.check_call([sys.executable, "-m", "venv", venv_path])
-            print("Installing dependencies...")
-            subprocess.check_call([os.path.join(venv_path, "bin", "python"), "-m", "pip", "install", "-r",
-                                   os.path.join(path, "sdk-core", "requirements.txt")])
+            self._remove_stale_installs()
+            os.mkdir(staging_path)
+            bar = self._progress_bar(total_size)
+            bar.start()
+            # Stream-mode tarfile reads in bufsize chunks, which default to a 10 KiB record.
+            with tarfile.open(fileobj=_ProgressReader(f, bar, self.PROGRESS_INTERVAL), mode="r|*",
+                              bufsize=self.DOWNLOAD_CHUNK_SIZE) as t:
+                t.extractall(staging_path, members=_checked_members(t))
+            bar.finish()
+            try:
+                with open(os.path.join(staging_path, 'sdk-core', 'manifest.json'), 'rb') as f_manifest:
+                    sdk_info = json.loads(f_manifest.read())
+            except (IOError, ValueError):
+                raise SDKInstallError("SDK is missing a valid manifest.")
+            sdk_path = os.path.normpath(os.path.join(self.sdk_dir, sdk_info['version']))
+            if os.path.exists(sdk_path):
+                raise SDKInstallError("SDK {} is already installed.".format(sdk_info['version']))
+            if not sdk_path.startswith(self.sdk_dir):
+                raise SDKInstallError("Suspicious version number: {}".format(sdk_info['version']))
+            Requirements(sdk_info['requirements']).ensure_satisfied()
+            os.rename(staging_path, sdk_path)
+            path = sdk_path
+            # The toolchain download and npm don't depend on the venv, so overlap them with it.
+            toolchain_future = _start_in_background(self._download_toolchain, sdk_info['version'], toolchain_cancel)
             package_json = os.path.join(path, "sdk-core", "package.json")
             if os.path.exists(package_json):
                 print("Installing JS dependencies... (this may take a while)")
                 node_modules_folder = os.path.join(path, "node_modules")
                 os.mkdir(node_modules_folder)
                 shutil.copy2(package_json, os.path.join(path, "package.json"))
-                invoke_npm(["install", "--silent"], cwd=path)
+                npm_future = _start_in_background(invoke_npm, ["install", "--silent"], cwd=path)
+            venv_path = os.path.join(path, ".venv")
+            print("Preparing venv... (this may take a while)")
+            self._create_venv(venv_path)
+            print("Installing dependencies...")
+            self._pip_install(venv_path, os.path.join(path, "sdk-core", "requirements.txt"))
+            if npm_future is not None:
+                npm_future.result()
 
             self.set_current_sdk(sdk_info['version'])
 
-            platform_name = "mac" if platform.system() == "Darwin" else "linux"
-            arch = platform.machine()
-
-            # Try architecture-specific toolchain first, fall back to platform-only
-            arch_specific_url = f"{self.DOWNLOAD_SERVER}/releases/{sdk_info['version']}/toolchain-{platform_name}-{arch}.tar.gz"
-            fallback_url = f"{self.DOWNLOAD_SERVER}/releases/{sdk_info['version']}/toolchain-{platform_name}.tar.gz"
-
-            try:
-                response = requests.head(arch_specific_url)
-                if response.status_code == 200:
-                    self.install_toolchain_from_url(arch_specific_url, sdk_info['version'], f"{platform_name}-{arch}")
-                else:
-                    self.install_toolchain_from_url(fallback_url, sdk_info['version'], platform_name)
-            except requests.RequestException:
-                self.install_toolchain_from_url(fallback_url, sdk_info['version'], platform_name)
+            if not toolchain_future.done():
+                # The download has no progress bar of its own, so don't leave the user staring at nothing.
+                print("Waiting for toolchain download...")
+            toolchain_file, platform_name = toolchain_future.result()
+            with toolchain_file:
+                self._install_toolchain_from_handle(toolchain_file, sdk_info['version'], platform_name)
 
             print("Done.")
         except BaseException:
             print("Failed.")
+            if toolchain_future is not None:
+                # Stop the download without waiting on it; whatever it spooled is discarded once it stops.
+                toolchain_cancel.set()
+                toolchain_future.add_done_callback(_discard_download)
+            if npm_future is not None:
+                # Don't delete the SDK out from under a running npm.
+                concurrent.futures.wait([npm_future])
             try:
-                if path is not None and os.path.exists(path):
-                    print("Cleaning up failed install...")
-                    shutil.rmtree(path)
-                    print("Done.")
+                for leftover in (staging_path, path):
+                    if leftover is not None and os.path.exists(leftover):
+                        print("Cleaning up failed install...")
+                        shutil.rmtree(leftover)
+                        print("Done.")
             except OSError:
                 print("Cleanup failed.")
             raise
 
+    def _remove_stale_installs(self):
+        # Staging directories are hidden from list_local_sdks, so nothing else would ever clear out the ones left by
+        # installs that were killed mid-extraction. Those of installs still running in other processes are kept.
+        with os.scandir(self.sdk_dir) as it:
+            entries = list(it)
+        for entry in entries:
+            prefix, _, pid = entry.name.partition('-')
+            if prefix != '.install' or not pid.isdigit():
+                continue
+            if int(pid) != os.getpid() and _process_exists(int(pid)):
+                continue
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+    @staticmethod
+    def _create_venv(venv_path):
+        # Equivalent to `python -m venv`, without paying for a second interpreter start.
+        venv.EnvBuilder(with_pip=True, symlinks=True).create(venv_path)
+
+    @staticmethod
+    def _pip_install(venv_path, requirements_path, cwd=None):
+        # Bytecode is compiled lazily on first import instead, and the version check would cost a network round trip.
+        subprocess.check_call([os.path.join(venv_path, "bin", "python"), "-m", "pip", "install",
+                               "--no-compile", "--disable-pip-version-check", "-r", requirements_path], cwd=cwd)
+
     def _install_toolchain_from_handle(self, f, sdk_version, platform_name):
+        import tarfile
         print("Extracting toolchain...")
 
         toolchain_path = os.path.normpath(os.path.join(self.sdk_dir, sdk_version, "toolchain"))
 
-        with tarfile.open(fileobj=f, mode="r:*") as t:
-            contents = t.getnames()
-
-            for filename in contents:
-                if filename.startswith('/') or '..' in filename:
-                    raise SDKInstallError("SDK contained a questionable file: {}".format(filename))
-            if not toolchain_path.startswith(self.sdk_dir):
-                raise SDKInstallError("Suspicious version number: {}".format(toolchain_path))
+        if not toolchain_path.startswith(self.sdk_dir):
+            raise SDKInstallError("Suspicious version number: {}".format(toolchain_path))
 
+        with tarfile.open(fileobj=f, mode="r|*") as t:
             os.mkdir(os.path.join(self.sdk_dir, sdk_version, "toolchain"))
-            t.extractall(toolchain_path)
+            t.extractall(toolchain_path, members=_checked_members(t))
 
-        for folder in os.listdir(os.path.join(toolchain_path, 'toolchain-' + platform_name)):
-            shutil.move(os.path.join(toolchain_path, 'toolchain-' + platform_name, folder), toolchain_path)
-        os.rmdir(os.path.join(toolchain_path, 'toolchain-' + platform_name))
+        # Hoist the contents out of the archive's top-level folder. Both live on the same filesystem, so a plain
+        # rename suffices. Take the listing first: readdir results are unspecified if entries move out mid-iteration.
+        staging_path = os.path.join(toolchain_path, 'toolchain-' + platform_name)
+        with os.scandir(staging_path) as it:
+            entries = list(it)
+        for entry in entries:
+            os.rename(entry.path, os.path.join(toolchain_path, entry.name))
+        os.rmdir(staging_path)
 
     def install_remote_sdk(self, version):
         sdk_info = self.request("/v1/files/sdk-core/{}?channel={}".format(version, self.get_channel())).json()
@@ -261,8 +470,8 @@ class SDKManager(object):
         if os.path.exists(path):
             if os.path.exists(manifest_path):
                 try:
-                    with open(manifest_path) as f:
-                        json.load(f)
+                    with open(manifest_path, 'rb') as f:
+                        json.loads(f.read())
                     raise SDKInstallError("SDK {} is already installed.".format(sdk_info['version']))
                 except (ValueError, IOError):
                     # Manifest is invalid or unreadable, clean up broken install
@@ -281,6 +490,7 @@ class SDKManager(object):
         self.install_from_url(sdk_info['url'])
 
     def _license_prompt(self):
+        import textwrap
         prompt = textwrap.dedent("""
         By using the Pebble SDK, you agree to the following:
 
@@ -309,8 +519,8 @@ class SDKManager(object):
         manifest_path = os.path.join(self.current_path, "manifest.json")
         if not os.path.exists(manifest_path):
             return None
-        with open(manifest_path) as f:
-            return json.load(f)['version']
+        with open(manifest_path, 'rb') as f:
+            return json.loads(f.read())['version']
 
     @classmethod
     def set_channel(cls, channel):
@@ -349,18 +559,23 @@ import sys
 subprocess.call([sys.executable, {}] + sys.argv[1:])
 """.format(repr(os.path.join(sdk_path, 'waf'))))
             os.chmod(os.path.join(pebble_path, 'waf'), 0o755)
-        for platform in get_pebble_platforms(sdk_path):
-            os.mkdir(os.path.join(pebble_path, platform))
-            os.symlink(os.path.join(sdk_path, platform, 'include'), os.path.join(pebble_path, platform, 'include'))
-            os.symlink(os.path.join(sdk_path, platform, 'lib'), os.path.join(pebble_path, platform, 'lib'))
-            os.mkdir(os.path.join(pebble_path, platform, 'qemu'))
-            os.symlink(os.path.join(build_path, 'qemu_micro_flash.bin'),
-                       os.path.join(pebble_path, platform, 'qemu', 'qemu_micro_flash.bin'))
-            os.symlink(os.path.join(build_path, 'qemu_spi_flash.bin'),
-                       os.path.join(pebble_path, platform, 'qemu', 'qemu_spi_flash.bin'))
-
-        os.symlink(os.path.join(sdk_path, 'common/'), 
-                   os.path.join(pebble_path, 'common'))
+        qemu_micro_flash = os.path.join(build_path, 'qemu_micro_flash.bin')
+        qemu_spi_flash = os.path.join(build_path, 'qemu_spi_flash.bin')
+        # Create the links relative to a handle on pebble_path, so it isn't re-resolved for every one of them.
+        pebble_fd = os.open(pebble_path, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            for platform in get_pebble_platforms(sdk_path):
+                platform_sdk_path = os.path.join(sdk_path, platform)
+                os.mkdir(platform, dir_fd=pebble_fd)
+                os.symlink(os.path.join(platform_sdk_path, 'include'), platform + '/include', dir_fd=pebble_fd)
+                os.symlink(os.path.join(platform_sdk_path, 'lib'), platform + '/lib', dir_fd=pebble_fd)
+                os.mkdir(platform + '/qemu', dir_fd=pebble_fd)
+                os.symlink(qemu_micro_flash, platform + '/qemu/qemu_micro_flash.bin', dir_fd=pebble_fd)
+                os.symlink(qemu_spi_flash, platform + '/qemu/qemu_spi_flash.bin', dir_fd=pebble_fd)
+
+            os.symlink(os.path.join(sdk_path, 'common/'), 'common', dir_fd=pebble_fd)
+        finally:
+            os.close(pebble_fd)
 
         with open(os.path.join(dest_path, 'manifest.json'), 'w') as f:
             json.dump({
@@ -371,11 +586,10 @@ subprocess.call([sys.executable, {}] + sys.argv[1:])
             }, f)
 
         print("Preparing venv... (this may take a while)")
-        subprocess.check_call([sys.executable, "-m", "venv", env_path])
+        self._create_venv(env_path)
         print("Installing dependencies...")
         print("This may fail installing Pillow==2.0.0. In that case, question why we still force 2.0.0 anyway.")
-        subprocess.check_call([os.path.join(env_path, "bin", "python"), "-m", "pip", "install", "-r",
-                               os.path.join(path, "requirements.txt")], cwd=path)
+        self._pip_install(env_path, os.path.join(path, "requirements.txt"), cwd=path)
         # if sys.platform.startswith('darwin'):
         #     platform = 'osx'
         #     subprocess.check_call([os.path.join(env_path, "bin", "python"), "-m", "pip", "install", "-r",
@@ -402,8 +616,23 @@ subprocess.call([sys.executable, {}] + sys.argv[1:])
     def _current_path(self):
         return os.path.join(self.sdk_dir, "current")
 
+    @property
+    def _session(self):
+        # Installs make several requests to the same server; reuse the connections rather than handshaking each time.
+        # requests is only imported here, as most commands never touch the network through the SDK manager.
+        if self._http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(total=3, backoff_factor=0.3))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._http_session = session
+        return self._http_session
+
     def request(self, path, *args):
-        return requests.get("{}{}".format(self.DOWNLOAD_SERVER, path), *args)
+        return self._session.get("{}{}".format(self.DOWNLOAD_SERVER, path), *args)
 
     def root_path_for_sdk(self, version):
         path = os.path.join(self.sdk_dir, version)
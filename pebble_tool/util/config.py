@@ -2,33 +2,55 @@
 __author__ = 'katharine'
 
 import json
-import os.path
+import os
 import threading
 
 from . import get_persist_dir
 
-
 class Config(object):
     def __init__(self):
         self.path = os.path.join(get_persist_dir(), 'settings.json')
         self.lock = threading.Lock()
         self.skip_save = False
         try:
-            with open(self.path) as f:
-                self.content = json.load(f)
+            with open(self.path, 'rb') as f:
+                data = f.read()
+            self.content = json.loads(data)
+            # What's on disk, for save() to compare against. Parsing again is cheaper than copy.deepcopy.
+            self._saved_content = json.loads(data)
         except IOError:
             self.content = {}
+            self._saved_content = {}
         except json.JSONDecodeError:
             self.content = {}
+            # Matches nothing, so the next save replaces the broken file.
+            self._saved_content = None
 
     def save(self):
         # Set by `wipe --everything` so cleanup doesn't recreate the directory
         # we just deleted.
         if self.skip_save:
             return
+        # Runs at every exit, so skip the write when nothing changed.
+        if self.content == self._saved_content:
+            return
         os.makedirs(os.path.dirname(self.path), exist_ok=True)
-        with open(self.path, 'w') as f:
-            json.dump(self.content, f, indent=4)
+        # Write to a temporary file and rename it into place, so a crash mid-write can't leave a truncated file.
+        tmp_path = '{}.{}.tmp'.format(self.path, os.getpid())
+        try:
+            data = json.dumps(self.content, indent=4)
+            with open(tmp_path, 'w') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._saved_content = json.loads(data)
 
     def get(self, key, default=None):
         return self.content.get(key, default)
@@ -1,24 +1,51 @@
 __author__ = 'katharine'
 
-import re
+import functools
 
-_version_parser = re.compile(r"^([0-9]+)(?:\.([0-9]+))?(?:\.([0-9]+))?(?:\-(beta|rc|dp)([0-9]+))?")
+_DIGITS = '0123456789'
+# Pre-release suffixes and their sort order, most common first.
+_SUFFIXES = (
+    ('beta', -2),
+    ('rc', -1),
+    ('dp', -3),
+)
 
+# Shared keys for bare major versions ("0" through "31"), so they skip parsing and don't allocate.
+_COMMON = {str(i): (i, 0, 0, 0, 0, "") for i in range(32)}
 
+
+def _split_number(text):
+    rest = text.lstrip(_DIGITS)
+    return text[:len(text) - len(rest)], rest
+
+
+# Equivalent to matching r"^([0-9]+)(?:\.([0-9]+))?(?:\.([0-9]+))?(?:\-(beta|rc|dp)([0-9]+))?" against the start of
+# the version, without the regex; anything after the match is ignored.
+@functools.lru_cache(maxsize=512)
 def version_to_key(version):
-    result = _version_parser.match(version)
-    if result is None:
+    key = _COMMON.get(version)
+    if key is not None:
+        return key
+    number, rest = _split_number(version)
+    if not number:
         return (0, 0, 0, 0, 0, version)
-    suffix_mapping = {
-        'dp': -3,
-        'beta': -2,
-        'rc': -1,
-        None: 0,
-    }
-
-    return (int(result.group(1)),
-            int(result.group(2) or 0),
-            int(result.group(3) or 0),
-            suffix_mapping[result.group(4)],
-            int(result.group(5) or 0),
-            "")
+    parts = [int(number), 0, 0]
+    for i in (1, 2):
+        if not rest.startswith('.'):
+            break
+        number, remainder = _split_number(rest[1:])
+        if not number:
+            break
+        parts[i] = int(number)
+        rest = remainder
+
+    suffix = suffix_number = 0
+    if rest.startswith('-'):
+        for name, value in _SUFFIXES:
+            if rest.startswith(name, 1):
+                number, _ = _split_number(rest[1 + len(name):])
+                if number:
+                    suffix, suffix_number = value, int(number)
+                break
+
+    return (parts[0], parts[1], parts[2], suffix, suffix_number, "")
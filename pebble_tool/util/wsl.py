@@ -1,8 +1,6 @@
 import socket
 import sys
 
-import websocket
-
 __author__ = 'katharine'
 
 
@@ -20,6 +18,7 @@ def is_secretly_windows():
 def disable_tcp_keepcnt():
     if not hasattr(socket, 'TCP_KEEPCNT'):
         return
+    import websocket
     for i, (level, optname, value) in enumerate(websocket.DEFAULT_SOCKET_OPTION):
         if optname == socket.TCP_KEEPCNT:
             del websocket.DEFAULT_SOCKET_OPTION[i]
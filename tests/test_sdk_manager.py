@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import time
+
+import pytest
+
+from pebble_tool.exceptions import SDKInstallError
+from pebble_tool.sdk.manager import SDKManager
+
+
+def _tarball(files, mode="w:gz"):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode=mode) as t:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            t.addfile(info, io.BytesIO(content))
+    buf.seek(0)
+    return buf
+
+
+def _sdk_tarball(tmp_path, version="4.9", extra=None, mode="w:gz"):
+    files = {
+        "sdk-core/manifest.json": json.dumps({"version": version, "requirements": []}).encode(),
+        "sdk-core/requirements.txt": b"",
+    }
+    files.update(extra or {})
+    path = tmp_path / "sdk-{}.tar.gz".format(version)
+    path.write_bytes(_tarball(files, mode).getvalue())
+    return str(path)
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    manager = SDKManager(sdk_dir=str(tmp_path / "SDKs"))
+    monkeypatch.setattr(manager, "_create_venv", lambda venv_path: os.mkdir(venv_path))
+    monkeypatch.setattr(manager, "_pip_install", lambda venv_path, requirements_path, cwd=None: None)
+    toolchain = {"toolchain-linux/bin/arm-none-eabi-gcc": b"gcc"}
+    monkeypatch.setattr(manager, "_download_toolchain",
+                        lambda sdk_version, cancel: (_tarball(toolchain), "linux"))
+    return manager
+
+
+def test_install_from_path(manager, tmp_path):
+    manager.install_from_path(_sdk_tarball(tmp_path))
+
+    sdk_path = os.path.join(manager.sdk_dir, "4.9")
+    assert sorted(os.listdir(manager.sdk_dir)) == ["4.9", "current"]
+    assert sorted(os.listdir(sdk_path)) == [".venv", "sdk-core", "toolchain"]
+    assert os.listdir(os.path.join(sdk_path, "toolchain")) == ["bin"]
+    assert os.path.exists(os.path.join(sdk_path, "toolchain", "bin", "arm-none-eabi-gcc"))
+    assert manager.get_current_sdk() == "4.9"
+
+
+def test_install_from_path_ignores_extension(manager, tmp_path):
+    # What a .tar.gz served with Content-Encoding: gzip looks like once decoded.
+    manager.install_from_path(_sdk_tarball(tmp_path, mode="w"))
+
+    assert manager.get_current_sdk() == "4.9"
+
+
+def test_install_from_path_rejects_escaping_member(manager, tmp_path):
+    path = _sdk_tarball(tmp_path, extra={"../evil": b"evil"})
+
+    with pytest.raises(SDKInstallError, match="questionable"):
+        manager.install_from_path(path)
+
+    assert os.listdir(manager.sdk_dir) == []
+    assert not os.path.exists(tmp_path / "evil")
+
+
+def test_reinstall_keeps_existing_sdk(manager, tmp_path):
+    path = _sdk_tarball(tmp_path)
+    manager.install_from_path(path)
+
+    with pytest.raises(SDKInstallError, match="already installed"):
+        manager.install_from_path(path)
+
+    assert sorted(os.listdir(manager.sdk_dir)) == ["4.9", "current"]
+    assert manager.get_current_sdk() == "4.9"
+    assert os.path.exists(os.path.join(manager.sdk_dir, "4.9", "toolchain", "bin", "arm-none-eabi-gcc"))
+
+
+def test_failed_install_discards_toolchain_download(manager, tmp_path, monkeypatch):
+    downloads = []
+
+    def download_toolchain(sdk_version, cancel):
+        downloads.append((_tarball({"toolchain-linux/bin/gcc": b"gcc"}), cancel))
+        return downloads[-1][0], "linux"
+
+    def pip_install(venv_path, requirements_path, cwd=None):
+        raise subprocess.CalledProcessError(1, "pip")
+
+    monkeypatch.setattr(manager, "_download_toolchain", download_toolchain)
+    monkeypatch.setattr(manager, "_pip_install", pip_install)
+
+    with pytest.raises(subprocess.CalledProcessError):
+        manager.install_from_path(_sdk_tarball(tmp_path))
+
+    f, cancel = downloads[0]
+    assert cancel.is_set()
+    # The download runs on another thread; it may only now be finishing.
+    for _ in range(100):
+        if f.closed:
+            break
+        time.sleep(0.01)
+    assert f.closed
+    assert os.listdir(manager.sdk_dir) == []
+
+
+def test_install_removes_stale_staging_dirs(manager, tmp_path):
+    dead = subprocess.Popen([sys.executable, "-c", ""])
+    dead.wait()
+    stale = os.path.join(manager.sdk_dir, ".install-{}".format(dead.pid))
+    running = os.path.join(manager.sdk_dir, ".install-{}".format(os.getppid()))
+    for path in (stale, running):
+        os.makedirs(os.path.join(path, "sdk-core"))
+
+    manager.install_from_path(_sdk_tarball(tmp_path))
+
+    assert not os.path.exists(stale)
+    assert os.path.exists(running)
+
+
+class _RangeResp:
+    def __init__(self, body, status_code=200, headers=None):
+        self._body = body
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self._body), chunk_size):
+            yield self._body[i:i + chunk_size]
+
+
+class _RangeSession:
+    """Serves `body` with byte-range support; `respond` can override the response to each range request."""
+    def __init__(self, body, respond=None):
+        self.body = body
+        self.respond = respond
+        self.head_kwargs = None
+
+    def head(self, url, **kwargs):
+        self.head_kwargs = kwargs
+        return _RangeResp(b"", headers={"content-length": str(len(self.body)), "accept-ranges": "bytes"})
+
+    def get(self, url, headers=None, stream=False):
+        start, end = (int(x) for x in headers["Range"][len("bytes="):].split("-"))
+        if self.respond is not None:
+            return self.respond(start, end)
+        return _RangeResp(self.body[start:end + 1], status_code=206)
+
+
+def _range_manager(tmp_path, session):
+    manager = SDKManager(sdk_dir=str(tmp_path / "SDKs"))
+    manager.RANGE_SIZE = 1000
+    manager.DOWNLOAD_CHUNK_SIZE = 300
+    manager._http_session = session
+    return manager
+
+
+def test_download_ranges_reassembles_file(tmp_path):
+    body = os.urandom(4500)
+    session = _RangeSession(body)
+    manager = _range_manager(tmp_path, session)
+
+    with open(tmp_path / "download", "w+b") as f:
+        manager._download_to_file("https://example.com/toolchain.tar.gz", f)
+        assert f.read() == body
+    assert session.head_kwargs == {"allow_redirects": True}
+
+
+def test_download_ranges_rejects_full_response(tmp_path):
+    body = os.urandom(4500)
+    manager = _range_manager(tmp_path, _RangeSession(body, respond=lambda start, end: _RangeResp(body)))
+
+    with open(tmp_path / "download", "w+b") as f:
+        with pytest.raises(SDKInstallError, match="ignored a range request"):
+            manager._download_to_file("https://example.com/toolchain.tar.gz", f)
+
+
+def test_download_ranges_rejects_short_range(tmp_path):
+    body = os.urandom(4500)
+    session = _RangeSession(body, respond=lambda start, end: _RangeResp(body[start:end], status_code=206))
+    manager = _range_manager(tmp_path, session)
+
+    with open(tmp_path / "download", "w+b") as f:
+        with pytest.raises(SDKInstallError, match="truncated"):
+            manager._download_to_file("https://example.com/toolchain.tar.gz", f)
+
+
+class _SlowRangeResp(_RangeResp):
+    def iter_content(self, chunk_size):
+        for content in super().iter_content(chunk_size):
+            time.sleep(0.02)
+            yield content
+
+
+def test_download_ranges_stops_writing_after_failure(tmp_path):
+    body = os.urandom(4500)
+
+    def respond(start, end):
+        if start == 0:
+            return _RangeResp(body)
+        return _SlowRangeResp(body[start:end + 1], status_code=206)
+
+    manager = _range_manager(tmp_path, _RangeSession(body, respond=respond))
+    manager.DOWNLOAD_CHUNK_SIZE = 10
+
+    with open(tmp_path / "download", "w+b") as f:
+        with pytest.raises(SDKInstallError, match="ignored a range request"):
+            manager._download_to_file("https://example.com/toolchain.tar.gz", f)
+    # Likely to reuse the download's descriptor number, which the other ranges were still writing to.
+    with open(tmp_path / "unrelated", "w+b") as unrelated:
+        time.sleep(0.2)
+        assert os.fstat(unrelated.fileno()).st_size == 0
@@ -3,24 +3,31 @@
 """
 from __future__ import annotations
 
+import argparse
+import importlib
+import subprocess
+import sys
+
 import pytest
 
 from pebble_tool import run_tool
+from pebble_tool.commands import COMMANDS
 
 @pytest.mark.parametrize(
     ["args", "expected"],
     [
         # Help menu should print and exit with success
         (["--help"], 0),
+        # Version should print and exit with success
+        (["-V"], 0),
         # Command that does not exist should exit with an error code.
         (["dne"], 2),
     ]
 )
 def test_smoke_cli(args: list[str], expected: int) -> None:
     """
-    Simple smoke test that ensures that the help menu is accessible and invalid commands are rejected. Successfully
-    executing the help menu should imply that most of the CLI's code has been _imported_, hopefully catching very
-    silly mistakes.
+    Simple smoke test that ensures that the help menu is accessible and invalid commands are rejected. Command
+    modules are only imported once selected; `test_command_table` covers importing them.
 
     :param args: Arguments to pass to the `pebble_tools` CLI.
     :param expected: Expected POSIX-style error code.
@@ -28,4 +35,54 @@ def test_smoke_cli(args: list[str], expected: int) -> None:
     with pytest.raises(SystemExit) as e:
         run_tool(args=args)
 
-    assert e.value.code == expected
\ No newline at end of file
+    assert e.value.code == expected
+
+# Modules that are slow to import and only needed once a command actually runs.
+HEAVY_MODULES = ["libpebble2", "requests", "websocket", "sh", "png", "PIL", "pebble_tool.commands.base"]
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--help"],
+        ["-V"],
+        ["dne"],
+    ]
+)
+def test_smoke_cli_no_heavy_imports(args: list[str]) -> None:
+    """
+    Printing help or the version, or rejecting an invalid command, must not import any command implementations, or
+    the modules they depend on. Runs in a fresh interpreter, since other tests import these modules into this one.
+
+    :param args: Arguments to pass to the `pebble_tools` CLI.
+    """
+    script = (
+        "import sys\n"
+        "from pebble_tool import run_tool\n"
+        "try:\n"
+        "    run_tool(args={args!r})\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(','.join(m for m in {heavy!r} if m in sys.modules))\n"
+    ).format(args=args, heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    loaded = result.stdout.splitlines()[-1]
+    assert loaded == ""
+
+
+def test_command_table() -> None:
+    """
+    The static command table used to build `pebble -h` must match the commands the modules actually define.
+    Importing every module and building its parser here also catches very silly mistakes in any of them.
+    """
+    for _, module, _ in COMMANDS:
+        importlib.import_module(module)
+    from pebble_tool.commands.base import _CommandRegistry, register_command
+
+    subparsers = argparse.ArgumentParser().add_subparsers()
+    for name, _, _ in COMMANDS:
+        register_command(subparsers, name)
+    assert list(subparsers.choices) == [name for name, _, _ in COMMANDS]
+
+    registered = {cls.command: (cls.__module__, cls.__doc__) for cls in _CommandRegistry}
+    assert {name: (module, help_text) for name, module, help_text in COMMANDS} == registered
@@ -3,62 +3,96 @@ from __future__ import annotations
 
 import json
 import os
-from unittest.mock import patch
 
 import pytest
 
-from pebble_tool.util.versions import version_to_key
-
 
 class TestVersionToKey:
-    def test_valid_version(self):
-        assert version_to_key("3.0.0") == (3, 0, 0, 0, 0, "")
-
-    def test_version_with_beta(self):
-        assert version_to_key("4.1.2-beta3") == (4, 1, 2, -2, 3, "")
-
-    def test_version_with_rc(self):
-        assert version_to_key("5.0.0-rc1") == (5, 0, 0, -1, 1, "")
-
-    def test_version_with_dp(self):
-        assert version_to_key("3.0.0-dp2") == (3, 0, 0, -3, 2, "")
-
-    def test_invalid_version(self):
-        assert version_to_key("notaversion") == (0, 0, 0, 0, 0, "notaversion")
-
-    def test_major_only(self):
-        assert version_to_key("3") == (3, 0, 0, 0, 0, "")
-
-    def test_major_minor(self):
-        assert version_to_key("3.1") == (3, 1, 0, 0, 0, "")
+    @pytest.mark.parametrize(
+        ["version", "expected"],
+        [
+            ("3.0.0", (3, 0, 0, 0, 0, "")),
+            ("4.1.2-beta3", (4, 1, 2, -2, 3, "")),
+            ("5.0.0-rc1", (5, 0, 0, -1, 1, "")),
+            ("3.0.0-dp2", (3, 0, 0, -3, 2, "")),
+            ("notaversion", (0, 0, 0, 0, 0, "notaversion")),
+            ("3", (3, 0, 0, 0, 0, "")),
+            ("3.1", (3, 1, 0, 0, 0, "")),
+            # Suffix directly after the minor version
+            ("3.1-rc2", (3, 1, 0, -1, 2, "")),
+            # Suffix without a number is ignored
+            ("3.0-beta", (3, 0, 0, 0, 0, "")),
+            # Parsing stops at the first component that isn't a number
+            ("3.x.5", (3, 0, 0, 0, 0, "")),
+            ("3..5", (3, 0, 0, 0, 0, "")),
+            # Trailing text is ignored
+            ("3.0.0.1", (3, 0, 0, 0, 0, "")),
+            ("3.0.0-beta2foo", (3, 0, 0, -2, 2, "")),
+            # No leading number at all
+            ("-beta1", (0, 0, 0, 0, 0, "-beta1")),
+        ]
+    )
+    def test_version_to_key(self, version, expected):
+        from pebble_tool.util.versions import version_to_key
+        assert version_to_key(version) == expected
+
+
+@pytest.fixture(scope="session")
+def empty_persist_dir(tmp_path_factory):
+    """A persist dir shared by tests that never write to it."""
+    return tmp_path_factory.mktemp("empty_config")
 
 
 class TestConfig:
-    def _make_config(self, tmp_path):
+    def _make_config(self, tmp_path, monkeypatch):
         from pebble_tool.util.config import Config
-        with patch("pebble_tool.util.config.get_persist_dir", return_value=str(tmp_path)):
-            return Config()
+        monkeypatch.setattr("pebble_tool.util.config.get_persist_dir", lambda: str(tmp_path))
+        return Config()
 
-    def test_config_missing_file(self, tmp_path):
-        config = self._make_config(tmp_path)
+    def test_config_missing_file(self, empty_persist_dir, monkeypatch):
+        config = self._make_config(empty_persist_dir, monkeypatch)
         assert config.content == {}
 
-    def test_config_get_set(self, tmp_path):
-        config = self._make_config(tmp_path)
+    def test_config_get_set(self, tmp_path, monkeypatch):
+        config = self._make_config(tmp_path, monkeypatch)
         config.set("key", "value")
         assert config.get("key") == "value"
         assert config.get("missing", "default") == "default"
 
-    def test_config_setdefault(self, tmp_path):
-        config = self._make_config(tmp_path)
+    def test_config_setdefault(self, empty_persist_dir, monkeypatch):
+        config = self._make_config(empty_persist_dir, monkeypatch)
         result = config.setdefault("key", "default")
         assert result == "default"
         assert config.get("key") == "default"
 
-    def test_config_save_and_reload(self, tmp_path):
-        config = self._make_config(tmp_path)
+    def test_config_save_and_reload(self, tmp_path, monkeypatch):
+        config = self._make_config(tmp_path, monkeypatch)
         config.set("key", "value")
         config.save()
-        assert os.path.exists(os.path.join(str(tmp_path), "settings.json"))
+        assert os.listdir(str(tmp_path)) == ["settings.json"]
         with open(os.path.join(str(tmp_path), "settings.json")) as f:
             assert json.load(f) == {"key": "value"}
+
+    def test_config_save_skips_unchanged(self, tmp_path, monkeypatch):
+        self._make_config(tmp_path, monkeypatch).save()
+        assert os.listdir(str(tmp_path)) == []
+
+        config = self._make_config(tmp_path, monkeypatch)
+        config.set("nested", {"key": "value"})
+        config.save()
+        mtime = os.stat(os.path.join(str(tmp_path), "settings.json")).st_mtime_ns
+        config.save()
+        self._make_config(tmp_path, monkeypatch).save()
+        assert os.stat(os.path.join(str(tmp_path), "settings.json")).st_mtime_ns == mtime
+
+        config.get("nested")["key"] = "changed"
+        config.save()
+        with open(os.path.join(str(tmp_path), "settings.json")) as f:
+            assert json.load(f) == {"nested": {"key": "changed"}}
+
+    def test_config_save_replaces_invalid_file(self, tmp_path, monkeypatch):
+        with open(os.path.join(str(tmp_path), "settings.json"), "w") as f:
+            f.write("{not json")
+        self._make_config(tmp_path, monkeypatch).save()
+        with open(os.path.join(str(tmp_path), "settings.json")) as f:
+            assert json.load(f) == {}